@@ -6,34 +6,83 @@ Google Photos Album Downloader
 This script downloads Google Photos albums using the Google Photos API.
 It authenticates using OAuth 2.0, allowing users to list albums,
 download specific albums by ID, or download all albums. Each album
-is saved as a separate .zip file. Now includes original quality downloads.
+is streamed into a separate .zip file. Now includes original quality downloads.
 """
 
 import argparse
+import calendar
+import hashlib
+import io
+import itertools
+import json
 import os
-import pickle
+import queue
+import random
+import re
+import shutil
+import tempfile
+import threading
 import time
 import zipfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 import requests
-from google.auth.transport.requests import Request
+import urllib3.util.connection
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build, Resource
-from googleapiclient.errors import HttpError
 from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
 
 # --- Configuration ---
 SCOPES = ['https://www.googleapis.com/auth/photoslibrary.readonly']
 CREDENTIALS_FILE = 'credentials.json'
 TOKEN_FILE = 'token.json'
 DOWNLOAD_DIR = Path('google_photos_downloads')
+ALBUMS_CACHE_FILE = DOWNLOAD_DIR / '.albums_cache.json'
+CACHE_TTL = 24 * 60 * 60  # seconds
 MAX_RETRIES = 3
-RETRY_DELAY = 5  # seconds
-API_SERVICE_NAME = 'photoslibrary'
-API_VERSION = 'v1'
+RETRY_DELAY = 2  # seconds, base delay for exponential backoff
+MAX_RETRY_DELAY = 60  # seconds
+DOWNLOAD_RETRY_STATUSES = (429, 500, 502, 503, 504)
+DOWNLOAD_CONCURRENCY = 16  # Default parallel media item downloads per album
+BATCH_GET_SIZE = 50  # Max media item IDs per mediaItems.batchGet request
+BASE_URL_REFRESH_AGE = 45 * 60  # seconds; baseUrls expire 60 minutes after they are fetched
+ALBUM_JOBS = 2  # Albums downloaded concurrently with --all
+COPY_BUFFER_SIZE = 1024 * 1024  # Bytes per read/write when moving media data
+SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Bytes of a media item buffered in memory before spilling to disk
+STREAM_THRESHOLD = SPOOL_MAX_SIZE  # Bytes; smaller items are read whole and written to the zip in one call
+HTTP_POOL_SIZE = 32  # Minimum keep-alive connections kept per host
+HTTP_POOL_HOSTS = 8  # Hosts with a cached pool: the API plus the lh*/video googleusercontent.com hosts
+# Media is already compressed; asking for it as-is keeps urllib3 from decoding it in Python.
+DOWNLOAD_HEADERS = {'Accept-Encoding': 'identity'}
+# Content-Range of a 206 reply: first byte offset and total size ('*' when unknown).
+CONTENT_RANGE_PATTERN = re.compile(r'bytes (\d+)-\d+/(\d+|\*)')
+# Zip compression methods selectable with --compress. Photos and videos are already
+# compressed, so storing them is nearly as small as deflating and far cheaper.
+COMPRESSION_METHODS = {
+    'store': zipfile.ZIP_STORED,
+    'deflate': zipfile.ZIP_DEFLATED,
+}
+# Fast levels: the default DEFLATE level 6 is several times slower for a marginal gain on media.
+COMPRESSION_LEVELS = {
+    zipfile.ZIP_DEFLATED: 1,
+}
+if hasattr(zipfile, 'ZIP_ZSTANDARD'):  # Python 3.14+
+    COMPRESSION_METHODS['zstd'] = zipfile.ZIP_ZSTANDARD
+    COMPRESSION_LEVELS[zipfile.ZIP_ZSTANDARD] = 3
+DEFAULT_COMPRESSION = 'store'
+# Anything but letters, digits (any script), '_', ' ' and '-' is dropped from album file names.
+UNSAFE_TITLE_CHARS = re.compile(r'[^\w \-]')
+API_ROOT_URL = 'https://photoslibrary.googleapis.com/'
+API_BASE_URL = f"{API_ROOT_URL}v1"
+API_TIMEOUT = 60  # seconds
+API_MAX_RETRIES = 5
+API_RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 # --- README Content ---
 README_TEXT = """
@@ -69,7 +118,7 @@ This script downloads your Google Photos albums using the Google Photos API.
         - Download the JSON file. Rename it to `credentials.json` and place it in the same directory as this script.
 3.  **Python Libraries:** Install the required libraries:
     ```bash
-    pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib requests tqdm
+    pip install google-auth google-auth-oauthlib requests urllib3 tqdm
     ```
 
 ## Usage
@@ -87,6 +136,13 @@ python google_photos_downloader.py [OPTIONS]
 -   `--list`: List all album names and their corresponding IDs, then exit.
 -   `--album-id <ALBUM_ID>`: Download only the album with the specified ID.
 -   `--all`: Download all albums found in your Google Photos library.
+-   `--jobs <N>`: Number of albums downloaded in parallel with `--all` (default: 2).
+-   `--refresh`: Fetch the album list and album contents again instead of reusing the copies cached for 24 hours in the download directory (use it after adding albums). Signing in again clears the cached album list.
+-   `--checksums`: Write a `<album>.sha256` file next to each zip with the SHA-256 of every item, computed while it downloads. Verify extracted files with `sha256sum -c`.
+-   `--prefer-ipv4`: Connect over IPv4 only. Use this if downloads stall for long periods on a network with broken IPv6.
+-   `--concurrency <N>`: Number of media items downloaded in parallel per album (default: 16). Lower it if Google starts throttling requests.
+-   `--stream-threshold <MiB>`: Media items up to this size are downloaded into memory and written to the zip in one go; larger ones are streamed through a temporary file (default: 8). Peak memory grows with this value times `--concurrency` and `--jobs`.
+-   `--compress {store,deflate,zstd}`: Zip compression method (default: `store`). Photos and videos are already compressed, so `deflate` mostly costs CPU time; `zstd` requires Python 3.14+.
 -   `--help`: Show the help message and exit.
 
 **First Run:**
@@ -101,6 +157,7 @@ Downloaded albums will be saved as `.zip` files in the `google_photos_downloads`
 
 - The script includes basic error handling for API requests and file operations.
 - It will retry downloading individual media items a few times if errors occur.
+- If a run is interrupted, the incomplete `<album>.zip.part` file is kept and the next run resumes it, downloading only the items it does not hold yet.
 - Ensure your `credentials.json` is correctly configured and placed.
 - If you encounter persistent authentication issues, try deleting the `token.json` file and re-running the script to re-authenticate.
 
@@ -121,9 +178,8 @@ def authenticate() -> Any:
     creds = None
     if os.path.exists(TOKEN_FILE):
         try:
-            with open(TOKEN_FILE, 'rb') as token:
-                creds = pickle.load(token)
-        except (pickle.UnpicklingError, EOFError, FileNotFoundError) as e:
+            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        except (ValueError, OSError) as e:  # Also covers tokens pickled by older versions
             logger.error(f"Error loading token file: {e}. Need to re-authenticate.")
             creds = None # Force re-authentication
 
@@ -149,14 +205,22 @@ def authenticate() -> Any:
             except Exception as e:
                 logger.error(f"Error during authentication flow: {e}")
                 exit(1)
+            # A new sign-in may be for another account, whose albums the cached list does not describe.
+            try:
+                ALBUMS_CACHE_FILE.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Warning: Could not remove album cache {ALBUMS_CACHE_FILE}: {e}")
 
-        try:
-            with open(TOKEN_FILE, 'wb') as token:
-                pickle.dump(creds, token)
-            logger.info(f"Authentication successful. Token saved to {TOKEN_FILE}")
-        except IOError as e:
-            logger.warning(f"Error saving token file: {e}")
-            # Continue execution even if token saving fails, but warn user.
+        if creds:
+            try:
+                with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
+                    token.write(creds.to_json())
+                logger.info(f"Authentication successful. Token saved to {TOKEN_FILE}")
+            except IOError as e:
+                logger.warning(f"Error saving token file: {e}")
+                # Continue execution even if token saving fails, but warn user.
 
     if not creds:
         logger.error("Authentication failed.")
@@ -164,57 +228,130 @@ def authenticate() -> Any:
 
     return creds
 
-# --- Google Photos API Service ---
-def get_photos_service(credentials: Any) -> Resource:
-    """Builds and returns the Google Photos API service."""
+# --- Google Photos API Session ---
+def create_photos_session(credentials: Any, pool_size: int = HTTP_POOL_SIZE) -> AuthorizedSession:
+    """Creates one authorized session whose keep-alive pool serves both API calls and media downloads.
+
+    The session is meant to live for the whole run; pool_size should cover every thread that can
+    download at once, otherwise urllib3 opens throwaway connections beyond it.
+    """
+    session = AuthorizedSession(credentials)
+    # urllib3 retries media requests that fail to connect or come back throttled or with a 5xx,
+    # honoring Retry-After. Bodies that break off midway are resumed by download_media_item instead.
+    download_retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_DELAY,
+        status_forcelist=DOWNLOAD_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand the final error response to raise_for_status
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=pool_size, max_retries=download_retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # API calls are rate limited per user; let urllib3 back off on 429/5xx, honoring Retry-After,
+    # instead of pacing every page with a fixed sleep. The longer prefix wins over 'https://'.
+    api_retry = Retry(
+        total=API_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=API_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'POST']),  # mediaItems:search is a read-only POST
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand the final error response to raise_for_status
+    )
+    api_adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=pool_size, max_retries=api_retry)
+    session.mount(API_ROOT_URL, api_adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+def prefer_ipv4() -> None:
+    """Makes urllib3 resolve and connect over IPv4 only, avoiding stalls on hosts with broken IPv6."""
+    urllib3.util.connection.HAS_IPV6 = False
+
+def call_photos_api(session: requests.Session, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+    """Calls a Google Photos Library API endpoint and returns its decoded JSON response."""
+    response = session.request(method, f"{API_BASE_URL}/{path}", timeout=API_TIMEOUT, **kwargs)
+    response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+    return response.json()
+
+# --- Local Caches ---
+def load_cache(cache_file: Path, max_age: float = CACHE_TTL) -> Optional[Any]:
+    """Returns the JSON data stored in a cache file if it exists and is younger than max_age seconds."""
     try:
-        service = build(API_SERVICE_NAME, API_VERSION, credentials=credentials, static_discovery=False)
-        return service
-    except Exception as e:
-        logger.error(f"Error building Google Photos service: {e}")
-        exit(1)
+        if time.time() - cache_file.stat().st_mtime > max_age:
+            return None
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Warning: Ignoring unreadable cache file {cache_file}: {e}")
+        return None
+
+def save_cache(cache_file: Path, data: Any) -> None:
+    """Atomically writes JSON data to a cache file."""
+    temp_cache_file = cache_file.with_name(cache_file.name + '.tmp')
+    try:
+        with open(temp_cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        temp_cache_file.replace(cache_file)
+    except OSError as e:
+        logger.warning(f"Warning: Could not write cache file {cache_file}: {e}")
 
 # --- Album Operations ---
-def list_albums(service: Resource) -> List[Dict[str, Any]]:
-    """Fetches and returns a list of all albums."""
+
+def list_albums(session: requests.Session, refresh: bool = False) -> List[Dict[str, Any]]:
+    """Fetches and returns a list of all albums, reusing a recently cached list unless refresh is set."""
+    if not refresh:
+        cached_albums = load_cache(ALBUMS_CACHE_FILE)
+        if cached_albums is not None:
+            logger.info(f"Using cached album list with {len(cached_albums)} albums (use --refresh to fetch it again).")
+            return cached_albums
+
     albums = []
     next_page_token = None
+    complete = False
     logger.info("Fetching albums...")
     try:
         while True:
-            results = service.albums().list(
-                pageSize=50,  # Max 50 per page
-                pageToken=next_page_token
-            ).execute()
+            results = call_photos_api(
+                session, 'GET', 'albums',
+                params={
+                    'pageSize': 50,  # Max 50 per page
+                    'pageToken': next_page_token
+                }
+            )
 
             found_albums = results.get('albums', [])
             if found_albums:
                 albums.extend(found_albums)
-                logger.info(f"Found {len(found_albums)} albums (Total: {len(albums)})...")
+                logger.debug(f"Found {len(found_albums)} albums (Total: {len(albums)})...")
             else:
-                logger.info("No albums found on this page.")
+                logger.debug("No albums found on this page.")
 
             next_page_token = results.get('nextPageToken')
             if not next_page_token:
+                complete = True
                 break
-            time.sleep(0.5) # Small delay between pages
-    except HttpError as error:
+    except requests.exceptions.HTTPError as error:
         logger.error(f"An API error occurred while listing albums: {error}")
     except Exception as e:
         logger.error(f"An unexpected error occurred while listing albums: {e}")
 
     logger.info(f"Finished fetching. Total albums found: {len(albums)}")
+    if complete:  # Never cache a list cut short by an error
+        save_cache(ALBUMS_CACHE_FILE, albums)
     return albums
 
-def get_album_by_id(service: Resource, album_id: str) -> Optional[Dict[str, Any]]:
+def get_album_by_id(session: requests.Session, album_id: str) -> Optional[Dict[str, Any]]:
     """Fetches a specific album by its ID."""
     logger.info(f"Fetching album details for ID: {album_id}...")
     try:
-        album = service.albums().get(albumId=album_id).execute()
+        album = call_photos_api(session, 'GET', f"albums/{album_id}")
         logger.info(f"Found album: '{album.get('title', 'Untitled')}'")
         return album
-    except HttpError as error:
-        if error.resp.status == 404:
+    except requests.exceptions.HTTPError as error:
+        if error.response.status_code == 404:
             logger.error(f"Error: Album with ID '{album_id}' not found.")
         else:
             logger.error(f"An API error occurred while fetching album {album_id}: {error}")
@@ -224,50 +361,181 @@ def get_album_by_id(service: Resource, album_id: str) -> Optional[Dict[str, Any]
         return None
 
 # --- Media Item Operations ---
-def get_album_media_items(service: Resource, album_id: str) -> List[Dict[str, Any]]:
-    """Fetches all media items for a given album ID."""
-    media_items = []
-    next_page_token = None
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yields successive lists of up to `size` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def search_album_media_items(session: requests.Session, album_id: str, page_token: Optional[str] = None) -> Dict[str, Any]:
+    """Fetches one page of media items for a given album ID."""
+    body = {
+        'albumId': album_id,
+        'pageSize': 100,  # Max 100 per page
+    }
+    if page_token:
+        body['pageToken'] = page_token
+    return call_photos_api(session, 'POST', 'mediaItems:search', json=body)
+
+def iter_album_media_item_pages(
+    session: requests.Session,
+    album_id: str,
+    on_listed: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+) -> Iterator[Tuple[float, List[Dict[str, Any]]]]:
+    """Yields the media items of a given album ID one page at a time, as soon as each page arrives.
+
+    Each page comes with the time.monotonic() at which it was fetched, which is when its baseUrls start to age.
+    Pages are listed on a background thread that runs ahead of the caller, however slowly it works through them.
+    If the listing completes without error, on_listed is called on that thread with every item before the last
+    page is handed over.
+    """
+    pages = queue.Queue()
+
+    def list_pages() -> None:
+        listed_items = []
+        try:
+            page_token = None
+            while True:
+                results = search_album_media_items(session, album_id, page_token)
+                found_items = results.get('mediaItems', [])
+                if found_items:
+                    listed_items.extend(found_items)
+                    logger.debug(f"Found {len(found_items)} media items (Total: {len(listed_items)})...")
+                    pages.put((time.monotonic(), found_items))
+                else:
+                    logger.debug("No media items found on this page.")
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+            logger.info(f"Finished fetching. Total media items found: {len(listed_items)}")
+            if on_listed:
+                on_listed(listed_items)
+        except requests.exceptions.HTTPError as error:
+            logger.error(f"An API error occurred while fetching media items for album {album_id}: {error}")
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while fetching media items for album {album_id}: {e}")
+        finally:
+            pages.put(None)  # End of the listing, complete or not
+
     logger.info(f"Fetching media items for album ID: {album_id}...")
+    # A daemon thread, so an interrupted run does not wait for the listing to finish before exiting.
+    threading.Thread(target=list_pages, name=f"list-{album_id}", daemon=True).start()
+    for page in iter(pages.get, None):
+        yield page
+
+def refresh_base_urls(session: requests.Session, media_items: List[Dict[str, Any]]) -> None:
+    """Replaces the baseUrl of each media item in place with a fresh one from mediaItems.batchGet."""
+    items_by_id = {item['id']: item for item in media_items if item.get('id')}
+    for media_item_ids in batched(items_by_id, BATCH_GET_SIZE):
+        try:
+            results = call_photos_api(session, 'GET', 'mediaItems:batchGet', params={'mediaItemIds': media_item_ids})
+        except requests.exceptions.RequestException as error:  # Also connection errors and timeouts
+            logger.warning(f"Warning: Could not refresh download URLs, keeping the existing ones: {error}")
+            continue
+        for result in results.get('mediaItemResults', []):
+            fresh_item = result.get('mediaItem')
+            if fresh_item and fresh_item.get('id') in items_by_id and fresh_item.get('baseUrl'):
+                items_by_id[fresh_item['id']]['baseUrl'] = fresh_item['baseUrl']
+
+def get_retry_delay(attempt: int, retry_delay: float = RETRY_DELAY) -> float:
+    """Returns the wait before the next attempt, backing off exponentially with jitter."""
+    delay = retry_delay * (2 ** attempt) + random.uniform(0, retry_delay)
+    return min(delay, MAX_RETRY_DELAY)
+
+def get_zip_date_time(media_item: Dict[str, Any]) -> Tuple[int, int, int, int, int, int]:
+    """Returns the zip entry timestamp for a media item, based on its creation time when available."""
+    creation_time = media_item.get('mediaMetadata', {}).get('creationTime', '')
     try:
-        while True:
-            results = service.mediaItems().search(
-                body={
-                    'albumId': album_id,
-                    'pageSize': 100,  # Max 100 per page
-                    'pageToken': next_page_token
-                }
-            ).execute()
-
-            found_items = results.get('mediaItems', [])
-            if found_items:
-                media_items.extend(found_items)
-                logger.info(f"Found {len(found_items)} media items (Total: {len(media_items)})...")
-            else:
-                logger.info("No media items found on this page.")
-
-            next_page_token = results.get('nextPageToken')
-            if not next_page_token:
-                break
-            time.sleep(0.5) # Small delay between pages
-    except HttpError as error:
-        logger.error(f"An API error occurred while fetching media items for album {album_id}: {error}")
-    except Exception as e:
-        logger.error(f"An unexpected error occurred while fetching media items for album {album_id}: {e}")
-
-    logger.info(f"Finished fetching. Total media items found: {len(media_items)}")
-    return media_items
+        # creationTime is UTC, while zip timestamps are read back as local time.
+        utc_time = time.strptime(creation_time[:19], '%Y-%m-%dT%H:%M:%S')
+        date_time = time.localtime(calendar.timegm(utc_time))[:6]
+    except (ValueError, OverflowError, OSError):
+        date_time = time.localtime()[:6]
+    if date_time[0] < 1980:  # Zip timestamps cannot predate 1980
+        date_time = (1980, 1, 1, 0, 0, 0)
+    return date_time
+
+def create_zip_info(zipf: zipfile.ZipFile, arcname: str, date_time: Tuple[int, int, int, int, int, int]) -> zipfile.ZipInfo:
+    """Creates an entry header that uses the archive's compression method and level."""
+    zip_info = zipfile.ZipInfo(arcname, date_time=date_time)
+    zip_info.external_attr = 0o644 << 16  # rw-r--r--, like the files ZipFile.write used to archive
+    zip_info.compress_type = zipf.compression
+    # ZipInfo only exposes its compression level publicly from Python 3.13 on.
+    if hasattr(zip_info, 'compress_level'):
+        zip_info.compress_level = zipf.compresslevel
+    else:
+        zip_info._compresslevel = zipf.compresslevel
+    return zip_info
+
+def read_partial_archive(
+    partial_zip_path: Path,
+    with_checksums: bool = False
+) -> Tuple[List[str], Dict[str, str]]:
+    """Returns the entry names (and, if requested, their SHA-256s) of an interrupted album zip."""
+    checksums = {}
+    with zipfile.ZipFile(partial_zip_path) as zipf:
+        names = zipf.namelist()
+        if with_checksums:
+            for name in names:
+                digest = hashlib.sha256()
+                with zipf.open(name) as entry:
+                    for chunk in iter(lambda: entry.read(COPY_BUFFER_SIZE), b''):
+                        digest.update(chunk)
+                checksums[name] = digest.hexdigest()
+    return names, checksums
+
+def get_media_item_filename(media_item: Dict[str, Any]) -> str:
+    """Returns the name a media item is stored under in the album zip."""
+    return media_item.get('filename', f"untitled_{media_item.get('id')}")
+
+def create_spool(spool_dir: Path, size: Optional[int] = None) -> IO[bytes]:
+    """Returns a temporary file for a download body: in memory when small, preallocated on disk when large."""
+    if size is None or size <= SPOOL_MAX_SIZE:
+        return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, dir=spool_dir)
+    spool = tempfile.TemporaryFile(dir=spool_dir)
+    try:
+        # Reserving the whole extent up front avoids fragmenting large videos as they grow.
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(spool.fileno(), 0, size)
+        else:
+            spool.truncate(size)
+    except OSError:
+        pass  # Preallocation is only an optimization; not every filesystem supports it
+    return spool
+
+def sync_and_evict(path: Path) -> None:
+    """Flushes a finished file to disk and lets the kernel drop its pages from the page cache."""
+    with open(path, 'r+b') as f:
+        os.fsync(f.fileno())
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass  # Only a hint; the archive is already safely on disk
 
 def download_media_item(
     session: requests.Session,
     media_item: Dict[str, Any],
-    download_path: Path,
+    zipf: zipfile.ZipFile,
+    zip_lock: threading.Lock,
+    spool_dir: Path,
     max_retries: int = MAX_RETRIES,
-    retry_delay: int = RETRY_DELAY
+    retry_delay: float = RETRY_DELAY,
+    checksums: Optional[Dict[str, str]] = None,
+    stream_threshold: int = STREAM_THRESHOLD,
+    byte_progress: Optional[tqdm] = None
 ) -> bool:
-    """Downloads a single media item with retries, attempting to get original quality."""
+    """Downloads a single media item with retries straight into the album zip, attempting to get original quality.
+
+    When a checksums dict is given, the item's SHA-256 is computed while it downloads and stored under its filename.
+    Items whose Content-Length is at most stream_threshold bytes are held in memory instead of being spooled.
+    Received bytes are counted on byte_progress, if given.
+    """
     item_id = media_item.get('id')
-    filename = media_item.get('filename', f"untitled_{item_id}")
+    filename = get_media_item_filename(media_item)
     base_url = media_item.get('baseUrl')
 
     if not base_url:
@@ -277,88 +545,265 @@ def download_media_item(
     # Attempt to get original quality download URL
     download_url = f"{base_url}=d"
 
-    filepath = download_path / filename
-    if filepath.exists():
-        logger.info(f"Skipping download, file already exists: {filepath.name}")
-        return True # Treat as success if already exists
+    logger.debug(f"  Downloading: {filename}...")
 
-    logger.info(f"  Downloading: {filename}...")
-
-    for attempt in range(max_retries):
-        try:
-            response = session.get(download_url, stream=True, timeout=60) # Increased timeout
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            logger.info(f"  Successfully downloaded: {filename}")
-            return True
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"  Error downloading {filename} (Attempt {attempt + 1}/{max_retries}): {e}")
-            if attempt < max_retries - 1:
-                logger.info(f"  Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"  Failed to download {filename} after {max_retries} attempts.")
-                if filepath.exists():
-                    try:
-                        filepath.unlink()
-                    except OSError as unlink_err:
-                        logger.warning(f"  Warning: Could not remove partial file {filepath}: {unlink_err}")
+    # The body is buffered (in memory up to stream_threshold, otherwise in a spool file) so that downloads
+    # run in parallel while only the final copy into the zip is serialized. The buffer outlives a failed
+    # attempt, so a transfer that broke off midway resumes with a Range request instead of starting over.
+    body = None
+    received = 0
+    expected_size = None
+    digest = None
+    try:
+        for attempt in range(max_retries):
+            reading_body = False
+            try:
+                headers = DOWNLOAD_HEADERS
+                if received:
+                    headers = {**DOWNLOAD_HEADERS, 'Range': f'bytes={received}-'}
+                with session.get(download_url, headers=headers, stream=True, timeout=60) as response:
+                    response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+                    if response.status_code == 206:
+                        # Appending any other part than the one asked for would silently corrupt the item.
+                        content_range = response.headers.get('Content-Range', '')
+                        match = CONTENT_RANGE_PATTERN.fullmatch(content_range)
+                        total_size = int(match.group(2)) if match and match.group(2) != '*' else None
+                        if (
+                            not received or not match or int(match.group(1)) != received
+                            or (expected_size is not None and total_size != expected_size)
+                        ):
+                            raise requests.exceptions.InvalidHeader(
+                                f"Unexpected Content-Range '{content_range}' for bytes={received}-", response=response
+                            )
+                    reading_body = True
+                    if response.status_code != 206:  # A full body, even if a range was asked for
+                        content_length = response.headers.get('Content-Length', '')
+                        expected_size = int(content_length) if content_length.isdigit() else None
+                        if body is None:
+                            if expected_size is not None and expected_size <= stream_threshold:
+                                body = io.BytesIO()
+                            else:
+                                body = create_spool(spool_dir, expected_size)
+                        received = 0
+                        digest = hashlib.sha256() if checksums is not None else None
+                    body.seek(received)
+                    for chunk in response.iter_content(chunk_size=COPY_BUFFER_SIZE):
+                        body.write(chunk)
+                        received += len(chunk)
+                        if digest:
+                            digest.update(chunk)
+                        if byte_progress is not None:
+                            byte_progress.update(len(chunk))
+                if expected_size is not None and received < expected_size:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"Connection closed after {received} of {expected_size} bytes"
+                    )
+                body.truncate()  # Drop any preallocated space the body did not fill
+                body.seek(0)
+
+                with zip_lock:
+                    zip_info = create_zip_info(zipf, filename, get_zip_date_time(media_item))
+                    if isinstance(body, io.BytesIO):
+                        # Typical photos: written to the zip in a single call.
+                        with body.getbuffer() as data:
+                            zipf.writestr(zip_info, data)
+                    else:
+                        with zipf.open(zip_info, 'w', force_zip64=True) as zip_entry:
+                            shutil.copyfileobj(body, zip_entry, COPY_BUFFER_SIZE)
+                    if digest:
+                        checksums[filename] = digest.hexdigest()
+                logger.debug(f"  Successfully downloaded: {filename}")
+                return True
+
+            except requests.exceptions.RequestException as e:
+                logger.error(f"  Error downloading {filename} (Attempt {attempt + 1}/{max_retries}): {e}")
+                # Connection failures and error statuses have already been retried by urllib3 where that
+                # can help; what is left to retry here is a body that broke off, or a range the server
+                # would not serve.
+                error_response = e.response
+                range_rejected = isinstance(e, requests.exceptions.InvalidHeader) or (
+                    error_response is not None and error_response.status_code == 416
+                )
+                if range_rejected:
+                    received = 0  # Fetch the whole body next time
+                retryable = reading_body or range_rejected
+                if retryable and attempt < max_retries - 1:
+                    delay = get_retry_delay(attempt, retry_delay)
+                    logger.info(f"  Retrying in {delay:.1f} seconds...")
+                    time.sleep(delay)
+                else:
+                    logger.error(f"  Failed to download {filename} after {attempt + 1} attempts.")
+                    return False
+            except Exception as e:
+                logger.error(f"  An unexpected error occurred during download of {filename}: {e}")
                 return False
-        except Exception as e:
-            logger.error(f"  An unexpected error occurred during download of {filename}: {e}")
-            return False
+    finally:
+        if body is not None:
+            body.close()
 
     return False # Should not be reached, but ensures a return value
 
 # --- Album Downloading and Zipping ---
+def get_safe_album_title(album: Dict[str, Any]) -> str:
+    """Returns the album title reduced to characters that are safe in a file name."""
+    album_id = album.get('id')
+    safe_album_title = UNSAFE_TITLE_CHARS.sub('', album.get('title', f"Untitled_Album_{album_id}")).rstrip()
+    return safe_album_title or f"Album_{album_id}"
+
+def get_album_file_names(albums: List[Dict[str, Any]]) -> List[str]:
+    """Returns a distinct file name per album; titles that clean up to the same name get the album ID appended."""
+    file_names = []
+    taken = set()
+    for album in albums:
+        file_name = get_safe_album_title(album)
+        if file_name.casefold() in taken:  # Compared caselessly for case-insensitive file systems
+            file_name = f"{file_name}_{album.get('id')}"
+        taken.add(file_name.casefold())
+        file_names.append(file_name)
+    return file_names
+
 def download_album(
-    service: Resource,
+    session: requests.Session,
     album: Dict[str, Any],
     base_download_dir: Path,
     max_retries: int = MAX_RETRIES,
-    retry_delay: int = RETRY_DELAY
+    retry_delay: float = RETRY_DELAY,
+    compression: int = COMPRESSION_METHODS[DEFAULT_COMPRESSION],
+    write_checksums: bool = False,
+    concurrency: int = DOWNLOAD_CONCURRENCY,
+    refresh: bool = False,
+    stream_threshold: int = STREAM_THRESHOLD,
+    file_name: Optional[str] = None
 ) -> None:
-    """Downloads all media items in an album and zips them."""
+    """Downloads all media items in an album, streaming them into a zip file.
+
+    With write_checksums, a sha256sum-style <album>.sha256 file listing every archived item is written next to the zip.
+    The album's media item list is kept in a manifest until the zip is complete, so a resumed run does not list
+    the album again unless refresh is set. file_name overrides the name derived from the album title, so albums
+    downloaded side by side never share files.
+    """
     album_id = album.get('id')
     album_title = album.get('title', f"Untitled_Album_{album_id}")
-    safe_album_title = "".join(c for c in album_title if c.isalnum() or c in (' ', '_', '-')).rstrip()
-    if not safe_album_title:
-        safe_album_title = f"Album_{album_id}"
+    safe_album_title = file_name or get_safe_album_title(album)
 
     logger.info(f"\nProcessing album: '{album_title}' (ID: {album_id})")
 
-    media_items = get_album_media_items(service, album_id)
-    if not media_items:
-        logger.info(f"No media items found in album '{album_title}'. Skipping zip creation.")
-        return
-
     temp_album_dir = base_download_dir / f"{safe_album_title}_temp"
     zip_file_path = base_download_dir / f"{safe_album_title}.zip"
+    checksum_file_path = base_download_dir / f"{safe_album_title}.sha256"
+    partial_zip_path = base_download_dir / f"{safe_album_title}.zip.part"
+    manifest_path = base_download_dir / f".{album_id}.manifest.json"
 
     if zip_file_path.exists():
         logger.info(f"Zip file already exists: {zip_file_path.name}. Skipping download.")
         return
 
+    # The manifest is only trusted while the album still holds the same number of items.
+    manifest = None if refresh else load_cache(manifest_path)
+    if (
+        isinstance(manifest, dict)
+        and isinstance(manifest.get('mediaItems'), list)
+        and isinstance(manifest.get('fetchedAt'), (int, float))
+        and manifest.get('mediaItemsCount') == album.get('mediaItemsCount')
+    ):
+        logger.info(f"Using cached media item list with {len(manifest['mediaItems'])} items (use --refresh to fetch it again).")
+        listed_at = time.monotonic() - (time.time() - manifest['fetchedAt'])
+        media_item_pages = iter([(listed_at, manifest['mediaItems'])])
+    else:
+        def save_manifest(listed_items: List[Dict[str, Any]]) -> None:
+            # Only a listing that saw every item is worth reusing.
+            if str(len(listed_items)) == str(album.get('mediaItemsCount')):
+                save_cache(manifest_path, {
+                    'mediaItemsCount': album.get('mediaItemsCount'),
+                    'fetchedAt': time.time(),
+                    'mediaItems': listed_items,
+                })
+
+        # Listing and downloading are pipelined: downloads start as soon as the first page arrives, while
+        # the listing runs ahead and is saved as soon as it ends, so an interrupted run can resume without it.
+        media_item_pages = iter_album_media_item_pages(session, album_id, save_manifest)
+    first_page = next(media_item_pages, None)
+    if not first_page or not first_page[1]:
+        logger.info(f"No media items found in album '{album_title}'. Skipping zip creation.")
+        return
+    media_item_pages = itertools.chain([first_page], media_item_pages)
+
     try:
         temp_album_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Created temporary directory: {temp_album_dir}")
 
-        download_count = 0
-        fail_count = 0
-        total_items = len(media_items)
+        outcomes = {True: 0, False: 0}
+        checksums = {} if write_checksums else None
 
-        with requests.Session() as session:
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_item = {executor.submit(download_media_item, session, item, temp_album_dir, max_retries, retry_delay): item for item in media_items}
-                for future in tqdm(as_completed(future_to_item), total=total_items, desc=f"Downloading {safe_album_title}"):
-                    if future.result():
-                        download_count += 1
-                    else:
-                        fail_count += 1
+        # An interrupted run leaves a closed, readable .part archive behind; append to it and
+        # skip everything it already holds instead of downloading the album from scratch.
+        zip_mode = 'w'
+        archived_names = []
+        if partial_zip_path.exists():
+            try:
+                archived_names, archived_checksums = read_partial_archive(partial_zip_path, write_checksums)
+                if checksums is not None:
+                    checksums.update(archived_checksums)
+                zip_mode = 'a'
+                logger.info(f"Resuming {partial_zip_path.name}: {len(archived_names)} items already downloaded.")
+            except (zipfile.BadZipFile, OSError) as e:
+                logger.warning(f"Warning: Discarding unreadable partial zip file {partial_zip_path.name}: {e}")
+                archived_names = []
+
+        logger.info(f"Creating zip file: {zip_file_path.name}...")
+        # Written under a .part name so an interrupted run never leaves a zip that looks complete.
+        with zipfile.ZipFile(
+            partial_zip_path, zip_mode, compression, allowZip64=True, compresslevel=COMPRESSION_LEVELS.get(compression)
+        ) as zipf:
+            zip_lock = threading.Lock()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+                    tqdm(total=0, desc=f"Downloading {safe_album_title}", unit='file') as progress, \
+                    tqdm(desc="  Received", unit='B', unit_scale=True, leave=False) as byte_progress:
+                # Sizes are only known once each response arrives, so bytes are shown as a running
+                # total and rate next to the per-file bar rather than with a byte-accurate total.
+                def collect(futures: Iterable[Future]) -> None:
+                    for future in futures:
+                        outcomes[future.result()] += 1
+                        progress.update()
+
+                pending = set()
+                # Names are claimed here on the producer thread, before any download starts, so a
+                # repeated filename is skipped without a lookup race between the workers.
+                queued_names = set(archived_names)
+                for listed_at, page in media_item_pages:
+                    progress.total += len(page)
+                    progress.refresh()
+                    # Batches no larger than the pool keep the bound below reachable at low concurrency.
+                    for batch in batched(page, min(BATCH_GET_SIZE, concurrency)):
+                        new_items = []
+                        for item in batch:
+                            filename = get_media_item_filename(item)
+                            if filename in queued_names:
+                                logger.debug(f"Skipping download, file already exists: {filename}")
+                                outcomes[True] += 1 # Treat as success if already exists
+                                progress.update()
+                            else:
+                                queued_names.add(filename)
+                                new_items.append(item)
+                        # Hold each batch back until the workers are about to run dry, so that its
+                        # baseUrls can be refreshed just before its downloads start and no more than
+                        # twice the pool size is ever queued.
+                        while len(pending) + len(new_items) > concurrency * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                        if time.monotonic() - listed_at > BASE_URL_REFRESH_AGE:
+                            refresh_base_urls(session, new_items)
+                        pending.update(
+                            executor.submit(
+                                download_media_item, session, item, zipf, zip_lock, temp_album_dir, max_retries, retry_delay,
+                                checksums, stream_threshold, byte_progress
+                            )
+                            for item in new_items
+                        )
+                collect(as_completed(pending))
+
+        download_count = outcomes[True]
+        fail_count = outcomes[False]
 
         if fail_count > 0:
             logger.warning(f"Warning: Failed to download {fail_count} items for album '{safe_album_title}'.")
@@ -366,42 +811,39 @@ def download_album(
         if download_count == 0 and fail_count > 0:
             logger.error(f"Error: No items were successfully downloaded for album '{safe_album_title}'. Skipping zip creation.")
             try:
-                for item_path in temp_album_dir.iterdir():
-                    item_path.unlink()
-                temp_album_dir.rmdir()
-                logger.info(f"Removed empty temporary directory: {temp_album_dir}")
-            except OSError as e:
-                logger.error(f"Error removing temporary directory {temp_album_dir}: {e}")
+                partial_zip_path.unlink()
+            except OSError as unlink_err:
+                logger.warning(f"Warning: Could not remove empty zip file {partial_zip_path}: {unlink_err}")
             return
 
-        logger.info(f"Creating zip file: {zip_file_path.name}...")
+        # Synced before the rename so a crash can never leave a truncated file under the final name,
+        # and evicted so a multi-gigabyte archive does not push everything else out of the page cache.
+        sync_and_evict(partial_zip_path)
+        partial_zip_path.replace(zip_file_path)
+        logger.info(f"Successfully created zip file: {zip_file_path.name}")
         try:
-            with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for item_path in temp_album_dir.iterdir():
-                    if item_path.is_file():
-                        zipf.write(item_path, arcname=item_path.name)
-            logger.info(f"Successfully created zip file: {zip_file_path.name}")
-        except zipfile.BadZipFile as e:
-            logger.error(f"Error creating zip file {zip_file_path.name}: {e}")
-            if zip_file_path.exists():
-                try:
-                    zip_file_path.unlink()
-                except OSError as unlink_err:
-                    logger.warning(f"Warning: Could not remove corrupted zip file {zip_file_path}: {unlink_err}")
-        except OSError as e:
-            logger.error(f"File system error during zipping for {zip_file_path.name}: {e}")
+            manifest_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as unlink_err:
+            logger.warning(f"Warning: Could not remove media item manifest {manifest_path.name}: {unlink_err}")
 
-    finally:
-        if temp_album_dir.exists():
-            logger.info(f"Cleaning up temporary directory: {temp_album_dir}")
+        if checksums:
             try:
-                for item_path in temp_album_dir.iterdir():
-                    item_path.unlink()
-                temp_album_dir.rmdir()
-                logger.info(f"Removed temporary directory: {temp_album_dir}")
+                with open(checksum_file_path, 'w', encoding='utf-8') as f:
+                    for filename in sorted(checksums):
+                        f.write(f"{checksums[filename]}  {filename}\n")
+                logger.info(f"Wrote checksums: {checksum_file_path.name}")
             except OSError as e:
-                logger.error(f"Error removing temporary directory {temp_album_dir}: {e}")
-                logger.info("Please remove it manually.")
+                logger.warning(f"Warning: Could not write checksum file {checksum_file_path.name}: {e}")
+    except OSError as e:
+        logger.error(f"File system error while writing zip file {zip_file_path.name}: {e}")
+
+    finally:
+        if partial_zip_path.exists():
+            logger.info(f"Keeping incomplete zip file {partial_zip_path.name}; run again to resume.")
+        logger.info(f"Cleaning up temporary directory: {temp_album_dir}")
+        shutil.rmtree(temp_album_dir, ignore_errors=True)
 
 # --- Main Execution ---
 def main():
@@ -429,6 +871,58 @@ def main():
         help='Download all albums.'
     )
 
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=ALBUM_JOBS,
+        metavar='N',
+        help=f'Number of albums to download in parallel with --all (default: {ALBUM_JOBS}).'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DOWNLOAD_CONCURRENCY,
+        metavar='N',
+        help=f'Number of media items to download in parallel per album (default: {DOWNLOAD_CONCURRENCY}).'
+    )
+
+    parser.add_argument(
+        '--stream-threshold',
+        type=int,
+        default=STREAM_THRESHOLD // (1024 * 1024),
+        metavar='MIB',
+        help=(
+            'Media items up to this many MiB are downloaded into memory and written in one go; larger ones are '
+            f'streamed through a temporary file (default: {STREAM_THRESHOLD // (1024 * 1024)}).'
+        )
+    )
+
+    parser.add_argument(
+        '--compress',
+        choices=sorted(COMPRESSION_METHODS),
+        default=DEFAULT_COMPRESSION,
+        help=f'Zip compression method (default: {DEFAULT_COMPRESSION}). Media files are already compressed.'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Fetch album and media item lists from Google Photos instead of using cached copies.'
+    )
+
+    parser.add_argument(
+        '--checksums',
+        action='store_true',
+        help='Write a SHA-256 checksum file next to each album zip, computed during download.'
+    )
+
+    parser.add_argument(
+        '--prefer-ipv4',
+        action='store_true',
+        help='Connect over IPv4 only. Use this if downloads stall on a network with broken IPv6.'
+    )
+
     parser.add_argument(
         '--readme',
         action='store_true',
@@ -445,6 +939,14 @@ def main():
         parser.print_help()
         exit(0)
 
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+    if args.stream_threshold < 0:
+        parser.error("--stream-threshold cannot be negative.")
+    stream_threshold = args.stream_threshold * 1024 * 1024
+
     logger.info("Starting Google Photos Downloader...")
 
     try:
@@ -454,38 +956,72 @@ def main():
         logger.error(f"Error creating download directory {DOWNLOAD_DIR}: {e}")
         exit(1)
 
+    compression = COMPRESSION_METHODS[args.compress]
+    if args.prefer_ipv4:
+        prefer_ipv4()
     credentials = authenticate()
-    service = get_photos_service(credentials)
-
-    if args.list:
-        albums = list_albums(service)
-        if albums:
-            logger.info("\nAvailable Albums:")
-            logger.info("-" * 30)
-            for album in albums:
-                logger.info(f"  Title: {album.get('title', 'Untitled')}")
-                logger.info(f"  ID:    {album.get('id')}")
+    # One session for the whole run, sized so every concurrent download keeps a warm connection.
+    session = create_photos_session(credentials, max(HTTP_POOL_SIZE, args.jobs * args.concurrency))
+
+    # Route log records through tqdm so they don't break the progress bars.
+    with logging_redirect_tqdm():
+        if args.list:
+            albums = list_albums(session, args.refresh)
+            if albums:
+                logger.info("\nAvailable Albums:")
                 logger.info("-" * 30)
-        else:
-            logger.info("No albums found in your library.")
-
-    elif args.album_id:
-        album = get_album_by_id(service, args.album_id)
-        if album:
-            download_album(service, album, DOWNLOAD_DIR, MAX_RETRIES, RETRY_DELAY)
-        else:
-            logger.error(f"Could not proceed with download for album ID: {args.album_id}")
-
-    elif args.all:
-        albums = list_albums(service)
-        if albums:
-            logger.info(f"\nStarting download for {len(albums)} albums...")
-            for i, album in enumerate(albums):
-                logger.info(f"\n--- Album {i+1}/{len(albums)} ---")
-                download_album(service, album, DOWNLOAD_DIR, MAX_RETRIES, RETRY_DELAY)
-            logger.info("\nFinished downloading all albums.")
-        else:
-            logger.info("No albums found to download.")
+                for album in albums:
+                    logger.info(f"  Title: {album.get('title', 'Untitled')}")
+                    logger.info(f"  ID:    {album.get('id')}")
+                    logger.info("-" * 30)
+            else:
+                logger.info("No albums found in your library.")
+
+        elif args.album_id:
+            album = get_album_by_id(session, args.album_id)
+            if album:
+                # Named exactly as under --all, so either command finds the other's partial and finished zips.
+                albums = list_albums(session, args.refresh)
+                if not any(listed.get('id') == album.get('id') for listed in albums):
+                    albums.append(album)
+                file_names = {listed.get('id'): name for listed, name in zip(albums, get_album_file_names(albums))}
+                download_album(
+                    session, album, DOWNLOAD_DIR, MAX_RETRIES, RETRY_DELAY, compression, args.checksums, args.concurrency,
+                    args.refresh, stream_threshold, file_names[album.get('id')]
+                )
+            else:
+                logger.error(f"Could not proceed with download for album ID: {args.album_id}")
+
+        elif args.all:
+            albums = list_albums(session, args.refresh)
+            if albums:
+                logger.info(f"\nStarting download for {len(albums)} albums ({args.jobs} at a time)...")
+                with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+                    # Albums whose titles clean up to the same name would otherwise write the same files at once.
+                    future_to_album = {
+                        executor.submit(
+                            download_album, session, album, DOWNLOAD_DIR, MAX_RETRIES, RETRY_DELAY, compression,
+                            args.checksums, args.concurrency, args.refresh, stream_threshold, file_name
+                        ): album
+                        for album, file_name in zip(albums, get_album_file_names(albums))
+                    }
+                    try:
+                        for i, future in enumerate(as_completed(future_to_album)):
+                            album = future_to_album[future]
+                            try:
+                                future.result()
+                            except Exception as e:
+                                logger.error(f"An unexpected error occurred while downloading album '{album.get('title', 'Untitled')}': {e}")
+                            logger.info(f"\n--- Finished album {i+1}/{len(albums)} ---")
+                    except KeyboardInterrupt:
+                        # Otherwise leaving the executor would wait for every queued album to download.
+                        logger.info("\nInterrupted; finishing the albums in progress. Run again to resume.")
+                        for future in future_to_album:
+                            future.cancel()
+                        raise
+                logger.info("\nFinished downloading all albums.")
+            else:
+                logger.info("No albums found to download.")
 
     logger.info("\nGoogle Photos Downloader finished.")
 
@@ -0,0 +1,93 @@
+import itertools
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import google_photos_downloader as downloader
+
+PAGE_SIZE = 100
+
+
+def make_media_items(count):
+    return [
+        {'id': f"item{i}", 'filename': f"photo{i}.jpg", 'baseUrl': f"https://example.invalid/item{i}"}
+        for i in range(count)
+    ]
+
+
+def fake_search(media_items):
+    """Returns a stand-in for search_album_media_items that pages through media_items."""
+    def search(session, album_id, page_token=None):
+        start = int(page_token or 0)
+        results = {'mediaItems': media_items[start:start + PAGE_SIZE]}
+        if start + PAGE_SIZE < len(media_items):
+            results['nextPageToken'] = str(start + PAGE_SIZE)
+        return results
+    return search
+
+
+class InterruptedDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.download_dir = Path(temp_dir.name)
+        self.media_items = make_media_items(300)
+        self.album = {'id': 'C1', 'title': 'Big', 'mediaItemsCount': str(len(self.media_items))}
+        self.manifest_path = self.download_dir / '.C1.manifest.json'
+
+    def interrupt_after(self, downloads):
+        """Returns a stand-in for download_media_item that raises KeyboardInterrupt on its given call."""
+        counter = itertools.count(1)
+        lock = threading.Lock()
+
+        def download(*args, **kwargs):
+            time.sleep(0.001)
+            with lock:
+                call = next(counter)
+            if call == downloads:
+                raise KeyboardInterrupt
+            return True
+        return download
+
+    def test_manifest_is_saved_before_an_interrupt(self):
+        with mock.patch.object(downloader, 'search_album_media_items', fake_search(self.media_items)), \
+                mock.patch.object(downloader, 'download_media_item', self.interrupt_after(116)):
+            with self.assertRaises(KeyboardInterrupt):
+                downloader.download_album(None, self.album, self.download_dir, concurrency=16)
+
+        self.assertTrue((self.download_dir / 'Big.zip.part').exists())
+        self.assertTrue(self.manifest_path.exists())
+        manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        self.assertEqual(manifest['mediaItems'], self.media_items)
+
+    def test_resume_uses_the_manifest_instead_of_listing(self):
+        with mock.patch.object(downloader, 'search_album_media_items', fake_search(self.media_items)), \
+                mock.patch.object(downloader, 'download_media_item', self.interrupt_after(116)):
+            with self.assertRaises(KeyboardInterrupt):
+                downloader.download_album(None, self.album, self.download_dir, concurrency=16)
+
+        search = mock.Mock(side_effect=fake_search(self.media_items))
+        with mock.patch.object(downloader, 'search_album_media_items', search), \
+                mock.patch.object(downloader, 'download_media_item', return_value=True):
+            downloader.download_album(None, self.album, self.download_dir, concurrency=16)
+
+        search.assert_not_called()
+        self.assertTrue((self.download_dir / 'Big.zip').exists())
+        self.assertFalse(self.manifest_path.exists())
+
+    def test_malformed_manifest_is_ignored(self):
+        self.manifest_path.write_text(json.dumps({'mediaItemsCount': self.album['mediaItemsCount']}), encoding='utf-8')
+        with mock.patch.object(downloader, 'search_album_media_items', fake_search(self.media_items)), \
+                mock.patch.object(downloader, 'download_media_item', return_value=True):
+            downloader.download_album(None, self.album, self.download_dir, concurrency=16)
+
+        self.assertTrue((self.download_dir / 'Big.zip').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()